@@ -4,114 +4,252 @@ Synthetic Trace Generator for DCI Testing
 Generates Zipkin-compatible trace data for testing RMT DCI calculations
 """
 
-import json
-import random
 import sys
-from typing import List, Dict, Tuple
+from collections import defaultdict, deque
+from functools import lru_cache
+from types import MappingProxyType
+from typing import List, Dict, Optional, Tuple
 
-def generate_microservice_traces(services: List[str], 
-                                call_patterns: List[Tuple[str, str, int]],
-                                num_traces: int = 100) -> List[Dict]:
+import numpy as np
+import orjson
+
+# Coupling status labels and their lower DCI bounds (> 0, >= 0.4, >= 0.7)
+COUPLING_LEVELS = np.array(["No", "Low", "Moderate", "High"])
+COUPLING_BINS = np.array([np.nextafter(0.0, 1.0), 0.4, 0.7])
+
+# Outgoing calls of a service that never acts as a caller
+_NO_CALLS = frozenset()
+
+# Traces sampled and serialised per write in write_traces (~100 KB of JSON)
+WRITE_CHUNK_SIZE = 1024
+
+# (caller, callee, frequency) call patterns, as stored in _PATTERNS
+CallPatterns = Tuple[Tuple[str, str, int], ...]
+
+def build_alias(weights: List[float]) -> Tuple[List[float], List[int]]:
+    """
+    Build Vose alias tables for O(1) weighted sampling
+    
+    Args:
+        weights: Non-negative weight per outcome
+    
+    Returns:
+        (prob, alias) tables; outcome i is kept with probability prob[i],
+        otherwise alias[i] is chosen
+    """
+    n = len(weights)
+    total = sum(weights)
+    scaled = [n * w / total for w in weights]
+    prob = [1.0] * n
+    alias = list(range(n))
+    
+    small = deque(i for i, q in enumerate(scaled) if q < 1.0)
+    large = deque(i for i, q in enumerate(scaled) if q >= 1.0)
+    
+    while small and large:
+        s = small.popleft()
+        l = large.popleft()
+        prob[s] = scaled[s]
+        alias[s] = l
+        scaled[l] -= 1.0 - scaled[s]
+        if scaled[l] < 1.0:
+            small.append(l)
+        else:
+            large.append(l)
+    
+    # Leftovers are 1.0 up to floating point error
+    return prob, alias
+
+@lru_cache(maxsize=None)
+def build_alias_for(call_patterns: CallPatterns) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Build (and cache) read-only alias tables for a set of call patterns
+    
+    Args:
+        call_patterns: Tuple of (caller, callee, frequency) tuples
+    
+    Returns:
+        (prob, alias) arrays as returned by build_alias
+    """
+    prob, alias = build_alias([freq for _, _, freq in call_patterns])
+    prob = np.array(prob, dtype=np.float64)
+    alias = np.array(alias, dtype=np.int64)
+    prob.flags.writeable = False
+    alias.flags.writeable = False
+    return prob, alias
+
+def sample_call_patterns(call_patterns: CallPatterns,
+                         num_traces: int = 100,
+                         rng: Optional[np.random.Generator] = None) -> np.ndarray:
+    """
+    Pick a call pattern for each trace, weighted by frequency
+    
+    Args:
+        call_patterns: Tuple of (caller, callee, frequency) tuples
+        num_traces: Total number of traces to generate
+        rng: Random generator to draw from (a fresh one if omitted)
+    
+    Returns:
+        Array of indices into call_patterns, one per trace
+    """
+    # Alias tables give O(1) weighted selection per trace; rows are made
+    # tuples so list-based patterns still work as a cache key
+    prob, alias = build_alias_for(tuple(map(tuple, call_patterns)))
+    
+    # Draw every pattern index in one batch instead of per-trace RNG calls
+    if rng is None:
+        rng = np.random.default_rng()
+    picks = rng.integers(len(call_patterns), size=num_traces)
+    keep = rng.random(num_traces) < prob[picks]
+    return np.where(keep, picks, alias[picks])
+
+def build_endpoints(call_patterns: CallPatterns) -> List[Tuple[Dict, Dict]]:
+    """
+    Build one (localEndpoint, remoteEndpoint) pair per call pattern
+    
+    Traces are never mutated after creation, so every trace sampled from
+    the same pattern shares these dicts instead of allocating its own.
+    """
+    return [
+        ({"serviceName": sys.intern(caller)}, {"serviceName": sys.intern(callee)})
+        for caller, callee, _ in call_patterns
+    ]
+
+def trace_ids(num_traces: int, first: int = 1):
+    """Lazily yield num_traces trace ids starting at first, formatted by C-level map/str"""
+    return map(str, range(first, first + num_traces))
+
+def build_trace(trace_id: str, local_endpoint: Dict, remote_endpoint: Dict) -> Dict:
+    """Build a single Zipkin-format trace object"""
+    return {
+        "traceId": trace_id,
+        "id": trace_id,
+        "localEndpoint": local_endpoint,
+        "remoteEndpoint": remote_endpoint
+    }
+
+def generate_microservice_traces(call_patterns: CallPatterns,
+                                 num_traces: int = 100,
+                                 rng: Optional[np.random.Generator] = None) -> List[Dict]:
     """
     Generate synthetic traces based on defined call patterns
     
     Args:
-        services: List of service names
-        call_patterns: List of (caller, callee, frequency) tuples
+        call_patterns: Tuple of (caller, callee, frequency) tuples
         num_traces: Total number of traces to generate
+        rng: Random generator to draw from, e.g. a seeded one for reproducible traces
     
     Returns:
         List of trace objects in Zipkin format
     """
-    traces = []
-    trace_id = 1
-    
-    # Calculate total frequency for weighted selection
-    total_frequency = sum(freq for _, _, freq in call_patterns)
-    
-    for _ in range(num_traces):
-        # Select call pattern based on frequency weights
-        rand_val = random.uniform(0, total_frequency)
-        cumulative = 0
-        
-        for caller, callee, freq in call_patterns:
-            cumulative += freq
-            if rand_val <= cumulative:
-                break
-        
-        # Generate trace
-        trace = {
-            "traceId": str(trace_id),
-            "id": str(trace_id),
-            "localEndpoint": {"serviceName": caller},
-            "remoteEndpoint": {"serviceName": callee}
-        }
-        traces.append(trace)
-        trace_id += 1
-    
-    return traces
+    indices = sample_call_patterns(call_patterns, num_traces, rng)
+    endpoints = build_endpoints(call_patterns)
+    return [
+        build_trace(trace_id, *endpoints[i])
+        for trace_id, i in zip(trace_ids(len(indices)), indices.tolist())
+    ]
 
-def create_common_patterns():
-    """Create common microservice architecture patterns"""
-    
-    patterns = {
-        "simple_chain": {
-            "services": ["frontend", "api-gateway", "user-service", "database"],
-            "calls": [
-                ("frontend", "api-gateway", 10),
-                ("api-gateway", "user-service", 8),
-                ("user-service", "database", 6)
-            ]
-        },
-        
-        "ecommerce": {
-            "services": ["web", "api", "user", "order", "payment", "inventory", "notification"],
-            "calls": [
-                ("web", "api", 15),
-                ("api", "user", 8),
-                ("api", "order", 6),
-                ("api", "payment", 4),
-                ("order", "inventory", 3),
-                ("order", "payment", 2),
-                ("payment", "notification", 1)
-            ]
-        },
-        
-        "microservice_mesh": {
-            "services": ["gateway", "auth", "user", "product", "order", "payment", "shipping", "analytics"],
-            "calls": [
-                ("gateway", "auth", 12),
-                ("gateway", "user", 10),
-                ("gateway", "product", 8),
-                ("gateway", "order", 6),
-                ("user", "auth", 4),
-                ("order", "payment", 3),
-                ("order", "shipping", 2),
-                ("order", "analytics", 1),
-                ("payment", "analytics", 1)
-            ]
-        },
-        
-        "event_driven": {
-            "services": ["producer", "event-bus", "consumer1", "consumer2", "consumer3", "database"],
-            "calls": [
-                ("producer", "event-bus", 20),
-                ("event-bus", "consumer1", 8),
-                ("event-bus", "consumer2", 6),
-                ("event-bus", "consumer3", 4),
-                ("consumer1", "database", 3),
-                ("consumer2", "database", 2)
-            ]
-        }
-    }
+def write_traces(output_file: str,
+                 call_patterns: CallPatterns,
+                 num_traces: int = 100,
+                 rng: Optional[np.random.Generator] = None) -> int:
+    """
+    Sample and stream traces to a JSON array file chunk by chunk
+    
+    Only WRITE_CHUNK_SIZE traces are sampled and serialised at a time, so
+    memory use stays flat regardless of num_traces.
+    
+    Args:
+        output_file: Path of the JSON file to write
+        call_patterns: Tuple of (caller, callee, frequency) tuples
+        num_traces: Total number of traces to generate
+        rng: Random generator shared by all chunks (a fresh one if omitted)
     
-    return patterns
+    Returns:
+        Number of traces written
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    endpoints = build_endpoints(call_patterns)
+    count = 0
+    with open(output_file, 'wb') as f:
+        f.write(b"[")
+        while count < num_traces:
+            chunk_size = min(WRITE_CHUNK_SIZE, num_traces - count)
+            indices = sample_call_patterns(call_patterns, chunk_size, rng)
+            chunk = b",\n".join(
+                orjson.dumps(build_trace(trace_id, *endpoints[i]))
+                for trace_id, i in zip(trace_ids(chunk_size, count + 1), indices.tolist())
+            )
+            f.write(b",\n" if count else b"\n")
+            f.write(chunk)
+            count += chunk_size
+        f.write(b"\n]\n")
+    
+    return count
+
+# Common microservice architecture patterns, shared read-only by all callers
+_PATTERNS = MappingProxyType({
+    "simple_chain": MappingProxyType({
+        "services": ("frontend", "api-gateway", "user-service", "database"),
+        "calls": (
+            ("frontend", "api-gateway", 10),
+            ("api-gateway", "user-service", 8),
+            ("user-service", "database", 6)
+        )
+    }),
+    
+    "ecommerce": MappingProxyType({
+        "services": ("web", "api", "user", "order", "payment", "inventory", "notification"),
+        "calls": (
+            ("web", "api", 15),
+            ("api", "user", 8),
+            ("api", "order", 6),
+            ("api", "payment", 4),
+            ("order", "inventory", 3),
+            ("order", "payment", 2),
+            ("payment", "notification", 1)
+        )
+    }),
+    
+    "microservice_mesh": MappingProxyType({
+        "services": ("gateway", "auth", "user", "product", "order", "payment", "shipping", "analytics"),
+        "calls": (
+            ("gateway", "auth", 12),
+            ("gateway", "user", 10),
+            ("gateway", "product", 8),
+            ("gateway", "order", 6),
+            ("user", "auth", 4),
+            ("order", "payment", 3),
+            ("order", "shipping", 2),
+            ("order", "analytics", 1),
+            ("payment", "analytics", 1)
+        )
+    }),
+    
+    "event_driven": MappingProxyType({
+        "services": ("producer", "event-bus", "consumer1", "consumer2", "consumer3", "database"),
+        "calls": (
+            ("producer", "event-bus", 20),
+            ("event-bus", "consumer1", 8),
+            ("event-bus", "consumer2", 6),
+            ("event-bus", "consumer3", 4),
+            ("consumer1", "database", 3),
+            ("consumer2", "database", 2)
+        )
+    })
+})
+
+def create_common_patterns():
+    """Return common microservice architecture patterns (read-only)"""
+    return _PATTERNS
 
 def main():
+    patterns = create_common_patterns()
+    
     if len(sys.argv) < 2:
         print("Usage: python3 generate_traces.py <pattern_name> [num_traces]")
         print("\nAvailable patterns:")
-        patterns = create_common_patterns()
         for name in patterns.keys():
             print(f"  - {name}")
         sys.exit(1)
@@ -119,8 +257,6 @@ def main():
     pattern_name = sys.argv[1]
     num_traces = int(sys.argv[2]) if len(sys.argv) > 2 else 100
     
-    patterns = create_common_patterns()
-    
     if pattern_name not in patterns:
         print(f"Unknown pattern: {pattern_name}")
         print("Available patterns:", list(patterns.keys()))
@@ -134,21 +270,15 @@ def main():
     print(f"Services: {', '.join(services)}")
     print(f"Call patterns: {len(calls)}")
     
-    traces = generate_microservice_traces(services, calls, num_traces)
-    
     output_file = f"traces_{pattern_name}.json"
-    with open(output_file, 'w') as f:
-        json.dump(traces, f, indent=2)
+    count = write_traces(output_file, calls, num_traces)
     
-    print(f"Generated {len(traces)} traces in {output_file}")
+    print(f"Generated {count} traces in {output_file}")
     
     # Print expected DCI analysis
     print("\nExpected DCI Analysis:")
     print("Services and their outgoing calls:")
-    service_calls = {}
-    for service in services:
-        service_calls[service] = set()
-    
+    service_calls = defaultdict(set)
     for caller, callee, _ in calls:
         service_calls[caller].add(callee)
     
@@ -156,12 +286,17 @@ def main():
     print(f"Max possible couplings: {max_possible}")
     print()
     
-    for service in services:
-        actual_calls = len(service_calls[service])
-        dci = actual_calls / max_possible if max_possible > 0 else 0
-        status = "High" if dci >= 0.7 else "Moderate" if dci >= 0.4 else "Low" if dci > 0 else "No"
-        print(f"{service}: {actual_calls}/{max_possible} = {dci:.3f} ({status} Coupling)")
+    actual_calls = np.fromiter((len(service_calls.get(s, _NO_CALLS)) for s in services),
+                               dtype=np.int64, count=len(services))
+    dcis = actual_calls / max_possible if max_possible > 0 else np.zeros(len(services))
+    statuses = COUPLING_LEVELS[np.searchsorted(COUPLING_BINS, dcis, side='right')]
+    
+    lines = [
+        f"{service}: {calls_made}/{max_possible} = {dci:.3f} ({status} Coupling)"
+        for service, calls_made, dci, status
+        in zip(services, actual_calls.tolist(), dcis.tolist(), statuses.tolist())
+    ]
+    sys.stdout.write("\n".join(lines) + "\n")
 
 if __name__ == "__main__":
     main()
-
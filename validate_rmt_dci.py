@@ -12,7 +12,14 @@ import os
 def load_dci_results(csv_file):
     """Load RMT DCI results from CSV file"""
     try:
-        df = pd.read_csv(csv_file)
+        # Only these columns are used downstream; explicit dtypes skip inference.
+        # DCI stays float64 so the 0.7 threshold compares exactly.
+        df = pd.read_csv(
+            csv_file,
+            usecols=['Service', 'DCI', 'Status'],
+            dtype={'Service': 'string', 'DCI': 'float64', 'Status': 'category'},
+            engine='c'
+        )
         print(f"✓ Loaded DCI results from {csv_file}")
         print(f"  Services analyzed: {len(df)}")
         print(f"  Average DCI score: {df['DCI'].mean():.3f}")
@@ -25,11 +32,11 @@ def analyze_dci_results(df):
     """Analyze RMT DCI results"""
     print("\n=== RMT DCI Analysis ===")
     
-    # Status distribution
+    # Status distribution (value_counts counts categorical codes in C)
     status_counts = df['Status'].value_counts()
-    print("Status Distribution:")
-    for status, count in status_counts.items():
-        print(f"  {status}: {count} services")
+    sys.stdout.write("Status Distribution:\n" + "".join(
+        f"  {status}: {count} services\n" for status, count in status_counts.items()
+    ))
     
     # Score statistics
     print(f"\nScore Statistics:")
@@ -38,19 +45,33 @@ def analyze_dci_results(df):
     print(f"  Mean: {df['DCI'].mean():.3f}")
     print(f"  Std: {df['DCI'].std():.3f}")
     
+    # Work on plain arrays to avoid per-row Series construction
+    dci = df['DCI'].to_numpy()
+    services = df['Service'].to_numpy()
+    
     # High coupling services
-    high_coupling = df[df['DCI'] >= 0.7]
-    if len(high_coupling) > 0:
-        print(f"\nHigh Coupling Services ({len(high_coupling)}):")
-        for _, row in high_coupling.iterrows():
-            print(f"  {row['Service']}: {row['DCI']:.3f}")
+    high_mask = dci >= 0.7
+    if high_mask.any():
+        print(f"\nHigh Coupling Services ({np.count_nonzero(high_mask)}):")
+        sys.stdout.write("".join(f"  {s}: {v:.3f}\n" for s, v in zip(services[high_mask], dci[high_mask])))
     
     # Isolated services
-    isolated = df[df['DCI'] == 0.0]
-    if len(isolated) > 0:
-        print(f"\nIsolated Services ({len(isolated)}):")
-        for _, row in isolated.iterrows():
-            print(f"  {row['Service']}")
+    isolated_mask = dci == 0.0
+    if isolated_mask.any():
+        print(f"\nIsolated Services ({np.count_nonzero(isolated_mask)}):")
+        sys.stdout.write("".join(f"  {s}\n" for s in services[isolated_mask]))
+
+def _lookup_join(dci_df, mci_df):
+    """Inner-join DCI and MCI frames on Service via index lookups instead of pd.merge"""
+    mci_by_service = mci_df.set_index('Service')
+    matched = dci_df[dci_df['Service'].isin(mci_by_service.index)].reset_index(drop=True)
+    
+    overlap = set(matched.columns) & set(mci_by_service.columns)
+    matched = matched.rename(columns={column: f"{column}_x" for column in overlap})
+    return matched.assign(**{
+        (f"{column}_y" if column in overlap else column): matched['Service'].map(mci_by_service[column])
+        for column in mci_by_service.columns
+    })
 
 def compare_with_mci(dci_df, mci_data_file=None):
     """Compare DCI results with MCI data"""
@@ -61,23 +82,38 @@ def compare_with_mci(dci_df, mci_data_file=None):
             mci_df = pd.read_csv(mci_data_file)
             print(f"✓ Loaded MCI data from {mci_data_file}")
             
-            # Merge data on service names
-            merged = pd.merge(dci_df, mci_df, on='Service', how='inner')
+            if mci_df['Service'].duplicated().any():
+                # A lookup needs unique keys; repeated services keep the merge semantics
+                merged = pd.merge(dci_df, mci_df, on='Service', how='inner')
+            else:
+                merged = _lookup_join(dci_df, mci_df)
             
             if len(merged) > 0:
-                # Calculate correlations
-                correlation = merged['DCI'].corr(merged['MCI_Afferent'])
+                # Overlapping columns get the same _x/_y suffixes as pd.merge
+                dci_column = 'DCI_x' if 'DCI' in mci_df.columns else 'DCI'
+                mci_column = 'MCI_Afferent_y' if 'MCI_Afferent' in dci_df.columns else 'MCI_Afferent'
+                dci = merged[dci_column].to_numpy(dtype=np.float64)
+                mci = merged[mci_column].to_numpy(dtype=np.float64)
+                services = merged['Service'].to_numpy()
+                
+                # Calculate correlations over services with both values present
+                present = ~(np.isnan(dci) | np.isnan(mci))
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    correlation = (np.corrcoef(dci[present], mci[present])[0, 1]
+                                   if np.count_nonzero(present) > 1 else np.nan)
                 print(f"Correlation (DCI vs MCI_Afferent): {correlation:.3f}")
                 
-                # Identify patterns
-                merged['Difference'] = abs(merged['DCI'] - merged['MCI_Afferent'])
-                high_diff = merged[merged['Difference'] > 0.3]
+                # Identify patterns (missing values never exceed the threshold)
+                diff = np.empty_like(dci)
+                np.subtract(dci, mci, out=diff)
+                np.abs(diff, out=diff)
+                high_diff = diff > 0.3
                 
-                print(f"Services with significant differences (>0.3): {len(high_diff)}")
-                if len(high_diff) > 0:
+                print(f"Services with significant differences (>0.3): {np.count_nonzero(high_diff)}")
+                if high_diff.any():
                     print("Services to investigate:")
-                    for _, row in high_diff.iterrows():
-                        print(f"  {row['Service']}: DCI={row['DCI']:.3f}, MCI={row['MCI_Afferent']:.3f}")
+                    rows = zip(services[high_diff], dci[high_diff], mci[high_diff])
+                    sys.stdout.write("".join(f"  {s}: DCI={d:.3f}, MCI={m:.3f}\n" for s, d, m in rows))
                 
                 return merged
             else:
@@ -95,12 +131,10 @@ def create_comparison_template(dci_df):
     """Create a template for manual MCI comparison"""
     template_file = "mci_comparison_template.csv"
     
-    template_df = dci_df[['Service', 'DCI']].copy()
-    template_df['MCI_Afferent'] = ''
-    template_df['MCI_Efferent'] = ''
-    template_df['Notes'] = ''
+    # Add the empty columns in one step so pandas allocates the frame once
+    template_df = dci_df[['Service', 'DCI']].assign(MCI_Afferent='', MCI_Efferent='', Notes='')
     
-    template_df.to_csv(template_file, index=False)
+    template_df.to_csv(template_file, index=False, lineterminator="\n", chunksize=10000)
     print(f"\n✓ Created MCI comparison template: {template_file}")
     print("  Fill in the MCI values from the research paper and run this script again")
 